@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 from src.data_loader import load_test_case
 from src.conflict_detector import detect_conflicts
+from src.geofence import load_geofences_for, check_geofences, merge_breaches
 from src.visualize_2d import plot_conflicts_2d
 from src.visualize_3d import plot_conflicts_3d
 from src.report_saver import save_to_pdf
@@ -17,8 +18,9 @@ def main():
     
     try:
         # Load data - using full path
-        mission_sets = load_test_case(TEST_DIR / "with_conflict.json")  # Default to with conflicts
-        # mission_sets = load_test_case(TEST_DIR / "without_conflict.json")  # Alternative
+        mission_file = TEST_DIR / "with_conflict.json"  # Default to with conflicts
+        # mission_file = TEST_DIR / "without_conflict.json"  # Alternative
+        mission_sets = load_test_case(mission_file)
     
         # Bifercate missions
         simulated = []
@@ -42,9 +44,9 @@ def main():
             for conflict in conflicts:
                 x, y, z = conflict['location']
                 output_text.append(f"At t={conflict['time']:.1f}s, position=({x:.1f}, {y:.1f}, {z:.1f}), "
-                    f"with {conflict['conflicting_drone']} (distance={conflict['distance']:.2f}m)")
+                    f"with {conflict['conflicting_drone']} (closest {conflict['distance']:.2f}m at t={conflict['closest_time']:.1f}s)")
                 print(f"At t={conflict['time']:.1f}s, position=({x:.1f}, {y:.1f}, {z:.1f}), "
-                    f"with {conflict['conflicting_drone']} (distance={conflict['distance']:.2f}m)")
+                    f"with {conflict['conflicting_drone']} (closest {conflict['distance']:.2f}m at t={conflict['closest_time']:.1f}s)")
                 
             plot_conflicts_2d(primary, simulated, conflicts, output_2d)
             plot_conflicts_3d(primary, simulated, conflicts, output_3d)
@@ -58,6 +60,18 @@ def main():
             output_text.append("2D Visualization saved to :- resources/conflict_2d.png")
             output_text.append("3D Visualization saved to :- resources/conflict_3d.png")
         
+        # Static no-fly zones next to the mission file
+        zones = load_geofences_for(mission_file)
+        if zones:
+            breaches = merge_breaches(check_geofences([primary], zones))
+            print(f"GEOFENCE BREACHES :- {len(breaches)}")
+            output_text.append(f"GEOFENCE BREACHES :- {len(breaches)}")
+            for breach in breaches:
+                line = (f"{breach['drone']} inside {breach['zone']} "
+                        f"from t={breach['entry_time']:.1f}s to t={breach['exit_time']:.1f}s")
+                print(line)
+                output_text.append(line)
+
         # Generate a report
         save_to_pdf(output_text, output_2d, "resources/mission_report.pdf")
     
@@ -12,7 +12,12 @@ from .models import Mission, Waypoint
 from .data_loader import load_test_case
 from .visualize_3d import plot_conflicts_3d
 from .visualize_2d import plot_conflicts_2d
-from .conflict_detector import detect_conflicts
+from .conflict_detector import detect_conflicts, iter_conflicts, has_conflict
+from .conflict_writers import write_conflicts_csv, write_conflicts_jsonl
+from .segment_kernel import mission_segments, segment_pair_kernel
+from .segment_bvh import SegmentBVH, bvh_first_breach
+from .probability_estimator import conflict_probability, add_conflict_probabilities
+from .geofence import load_geofences, load_geofences_for, GeofenceIndex, check_geofences, merge_breaches
 from .spatial_check import is_spatial_conflict
 from .temporal_check import is_temporal_conflict
 from .report_saver import save_to_pdf
@@ -24,6 +29,21 @@ __all__ = [
     'plot_conflicts_3d',
     'plot_conflicts_2d',
     'detect_conflicts',
+    'iter_conflicts',
+    'has_conflict',
+    'write_conflicts_csv',
+    'write_conflicts_jsonl',
+    'mission_segments',
+    'segment_pair_kernel',
+    'SegmentBVH',
+    'bvh_first_breach',
+    'conflict_probability',
+    'add_conflict_probabilities',
+    'load_geofences',
+    'load_geofences_for',
+    'GeofenceIndex',
+    'check_geofences',
+    'merge_breaches',
     'is_spatial_conflict',
     'is_temporal_conflict',
     'save_to_pdf'
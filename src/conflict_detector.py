@@ -1,46 +1,109 @@
 import numpy as np
+from typing import Iterator
 from .models import Mission
 from .temporal_check import is_temporal_conflict
 from .spatial_check import is_spatial_conflict
+from .segment_kernel import DEFAULT_CHUNK_BYTES, mission_segments, segment_pair_kernel
+from .segment_bvh import bvh_first_breach
 
-def detect_conflicts(mission_sets: list[Mission]) -> list[dict]:
+def split_missions(mission_sets: list[Mission]) -> tuple[Mission, list[Mission]]:
+    """Bifurcate missions into the primary and the simulated ones"""
     simulated = []
     for i in mission_sets:
         if i.type == "primary":
             primary = i
         elif i.type == "simulated":
             simulated.append(i)
-            
-    conflicts = []
-    
+    return primary, simulated
+
+def detect_conflicts(mission_sets: list[Mission], method: str = "vectorized",
+                     max_chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> list[dict]:
+    """ Output:- One conflict per simulated drone: time/location of the first moment it breaks the primary's
+        safety buffer, distance/closest_time of its closest approach.
+        method="vectorized" solves every segment pair exactly with NumPy (default),
+        using the missions' BVHs (Mission.build_bvh) when both sides have one,
+        method="sampled" is the original time-sampling loop. """
+    return list(iter_conflicts(mission_sets, method, max_chunk_bytes))
+
+def has_conflict(mission_sets: list[Mission], method: str = "vectorized",
+                 max_chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> bool:
+    """Go/no-go check, stops at the first conflicting drone"""
+    return next(iter_conflicts(mission_sets, method, max_chunk_bytes, batch_size=1), None) is not None
+
+def iter_conflicts(mission_sets: list[Mission], method: str = "vectorized",
+                   max_chunk_bytes: int = DEFAULT_CHUNK_BYTES, batch_size: int = 64) -> Iterator[dict]:
+    """ Generator version of detect_conflicts, yields each conflict as soon as its drone is checked.
+        Simulated drones go through the kernel `batch_size` at a time, so stopping early skips the rest. """
+    primary, simulated = split_missions(mission_sets)
+
+    if method == "sampled":
+        yield from _iter_conflicts_sampled(primary, simulated)
+        return
+    if method != "vectorized":
+        raise ValueError(f"Unknown detection method: {method}")
+
+    # Only check drones with overlapping time windows
+    candidates = [drone for drone in simulated
+                  if is_temporal_conflict(primary.time_window, drone.time_window)]
+    # Built on first use only: with BVHs on every drone the kernel never runs
+    primary_segments = primary.bvh.segments if primary.bvh is not None else None
+
+    for start in range(0, len(candidates), batch_size):
+        batch = candidates[start:start + batch_size]
+
+        # Long missions with a BVH on both sides are descended pairwise, the rest go through the kernel together
+        use_bvh = [primary.bvh is not None and drone.bvh is not None for drone in batch]
+        batch_results = iter(())
+        if not all(use_bvh):
+            if primary_segments is None:
+                primary_segments = mission_segments(primary)
+            breach, distance, closest = segment_pair_kernel(
+                primary_segments,
+                [mission_segments(drone) for drone, bvh in zip(batch, use_bvh) if not bvh],
+                primary.safety_buffer,
+                max_chunk_bytes
+            )
+            batch_results = zip(breach, distance, closest)
+
+        for drone, bvh in zip(batch, use_bvh):
+            t, min_distance, closest_time = (bvh_first_breach(primary.bvh, drone.bvh, primary.safety_buffer)
+                                             if bvh else next(batch_results))
+            if np.isfinite(t):
+                yield {
+                    'time': float(t),
+                    'location': primary.position_at(float(t)),
+                    'conflicting_drone': drone.id,
+                    'distance': float(min_distance),  # Closest approach, not the (= buffer) distance at entry
+                    'closest_time': float(closest_time)
+                }
+
+def _iter_conflicts_sampled(primary: Mission, simulated: list[Mission]) -> Iterator[dict]:
     for drone in simulated:
         # Only check drones with overlapping time windows
         if is_temporal_conflict(primary.time_window, drone.time_window):
-            
-            # Time sampling 
+
+            # Time sampling
             waypoint_times = {wp.t for wp in primary.waypoints + drone.waypoints}
             time_points = sorted(waypoint_times)  # Check near critical moments
-            
-            # Adding intermediate points (10 sample per second)
+
+            # Adding intermediate points (one sample every 10 seconds)
             time_points += list(np.arange(
                 max(primary.time_window[0], drone.time_window[0]),
                 min(primary.time_window[1], drone.time_window[1]),
-                10  # 10Hz sampling
+                10  # 10 s step
             ))
-            
+
             for t in time_points:
                 primary_pos = primary.position_at(t)
                 drone_pos = drone.position_at(t)
                 distance = np.linalg.norm(np.array(primary_pos) - np.array(drone_pos))
-                
+
                 # Only register the closest conflict per drone pair
                 if is_spatial_conflict(primary_pos, drone_pos, primary.safety_buffer):
-                    conflicts.append({
+                    yield {
                         'time': t,
                         'location': primary_pos,
                         'conflicting_drone': drone.id,
                         'distance': distance
-                    })
-                    break 
-    
-    return conflicts
\ No newline at end of file
+                    }
+                    break
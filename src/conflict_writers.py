@@ -0,0 +1,46 @@
+import csv
+import json
+import os
+from typing import Iterable
+
+CSV_FIELDS = ['time', 'x', 'y', 'z', 'conflicting_drone', 'distance', 'closest_time', 'probability']
+
+def _flatten(conflict: dict) -> dict:
+    """Plain-Python row for one conflict, location split into x/y/z"""
+    x, y, z = conflict['location']
+    row = {
+        'time': float(conflict['time']),
+        'x': float(x),
+        'y': float(y),
+        'z': float(z),
+        'conflicting_drone': conflict['conflicting_drone'],
+        'distance': float(conflict['distance'])
+    }
+    for key in ('closest_time', 'probability'):
+        if key in conflict:
+            row[key] = float(conflict[key])
+    return row
+
+def write_conflicts_csv(conflicts: Iterable[dict], output_path: str) -> int:
+    """ Append conflicts to a CSV file one row at a time, header only when the file is new.
+        Output:- number of rows written. """
+    new_file = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+    count = 0
+    with open(output_path, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        if new_file:
+            writer.writeheader()
+        for conflict in conflicts:
+            writer.writerow(_flatten(conflict))
+            count += 1
+    return count
+
+def write_conflicts_jsonl(conflicts: Iterable[dict], output_path: str) -> int:
+    """ Append conflicts to a JSON Lines file, one object per line.
+        Output:- number of lines written. """
+    count = 0
+    with open(output_path, 'a') as f:
+        for conflict in conflicts:
+            f.write(json.dumps(_flatten(conflict)) + '\n')
+            count += 1
+    return count
@@ -1,9 +1,10 @@
 import json
 from .models import Mission, Waypoint
 
-def load_test_case(file_path: str) -> list[Mission]:
+def load_test_case(file_path: str, bvh_min_waypoints: int | None = None) -> list[Mission]:
+    """Load missions from JSON. Missions with at least `bvh_min_waypoints` waypoints get a segment BVH built."""
     with open(file_path) as f:
-        return [
+        missions = [
             Mission(
                 type = drone.get("mission_type", f"simulated"),
                 id=drone.get("drone_id", f"drone_{i}"),
@@ -13,4 +14,10 @@ def load_test_case(file_path: str) -> list[Mission]:
                 safety_buffer=(drone.get("safety_buffer")) if "safety_buffer" in drone else 5.0
             )
             for i, drone in enumerate(json.load(f))
-        ]
\ No newline at end of file
+        ]
+
+    if bvh_min_waypoints is not None:
+        for mission in missions:
+            if len(mission.waypoints) >= bvh_min_waypoints:
+                mission.build_bvh()
+    return missions
@@ -0,0 +1,232 @@
+import json
+import numpy as np
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Union
+from .models import Mission
+from .segment_kernel import mission_segments
+
+@dataclass
+class PolygonZone:
+    """Polygon in the x/y plane extruded between floor and ceiling altitudes"""
+    id: str
+    vertices: List[tuple[float, float]]
+    floor: float = 0.0
+    ceiling: float = float('inf')
+
+    def bounds(self) -> tuple[float, float, float, float]:
+        xs, ys = zip(*self.vertices)
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def contains_xy(self, x: float, y: float) -> bool:
+        """Ray casting, vectorized over the edges"""
+        v = np.asarray(self.vertices, dtype=float)
+        x1, y1 = v[:, 0], v[:, 1]
+        x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+        straddles = (y1 > y) != (y2 > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+        return bool(np.count_nonzero(straddles & (x < x_cross)) % 2)
+
+    def horizontal_intervals(self, a: np.ndarray, d: np.ndarray) -> list[tuple[float, float]]:
+        """Parameter intervals u in [0, 1] where a + u*d lies inside the polygon"""
+        v = np.asarray(self.vertices, dtype=float)
+        e = np.roll(v, -1, axis=0) - v
+        w = v - a
+        denom = d[0] * e[:, 1] - d[1] * e[:, 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            u = (w[:, 0] * e[:, 1] - w[:, 1] * e[:, 0]) / denom
+            s = (w[:, 0] * d[1] - w[:, 1] * d[0]) / denom
+        hits = u[(denom != 0) & (s >= 0) & (s <= 1) & (u > 0) & (u < 1)]
+
+        # Between consecutive crossings the segment is either fully inside or fully outside (stationary: one piece)
+        breaks = np.unique(np.concatenate(([0.0], hits, [1.0])))
+        intervals = []
+        for lo, hi in zip(breaks[:-1], breaks[1:]):
+            mid = a + 0.5 * (lo + hi) * d
+            if self.contains_xy(mid[0], mid[1]):
+                if intervals and intervals[-1][1] == lo:
+                    intervals[-1] = (intervals[-1][0], hi)
+                else:
+                    intervals.append((lo, hi))
+        return intervals
+
+@dataclass
+class CylinderZone:
+    """Vertical cylinder (e.g. around an airport) between floor and ceiling altitudes"""
+    id: str
+    center: tuple[float, float]
+    radius: float
+    floor: float = 0.0
+    ceiling: float = float('inf')
+
+    def bounds(self) -> tuple[float, float, float, float]:
+        cx, cy = self.center
+        return cx - self.radius, cy - self.radius, cx + self.radius, cy + self.radius
+
+    def horizontal_intervals(self, a: np.ndarray, d: np.ndarray) -> list[tuple[float, float]]:
+        """Parameter intervals u in [0, 1] where a + u*d lies inside the circle"""
+        f = a - np.asarray(self.center, dtype=float)
+        qa = d @ d
+        qb = f @ d
+        qc = f @ f - self.radius ** 2
+        if qa == 0:
+            return [(0.0, 1.0)] if qc <= 0 else []
+        disc = qb * qb - qa * qc
+        if disc < 0:
+            return []
+        root = np.sqrt(disc)
+        lo, hi = max(0.0, (-qb - root) / qa), min(1.0, (-qb + root) / qa)
+        return [(lo, hi)] if lo <= hi else []
+
+Zone = Union[PolygonZone, CylinderZone]
+
+def load_geofences(file_path: str) -> list[Zone]:
+    with open(file_path) as f:
+        zones = []
+        for i, zone in enumerate(json.load(f)):
+            zone_id = zone.get("zone_id", f"zone_{i}")
+            floor = zone.get("floor", 0.0)
+            ceiling = zone.get("ceiling", float('inf'))
+            if zone["type"] == "polygon":
+                zones.append(PolygonZone(zone_id, [tuple(p) for p in zone["vertices"]], floor, ceiling))
+            elif zone["type"] == "cylinder":
+                zones.append(CylinderZone(zone_id, tuple(zone["center"]), zone["radius"], floor, ceiling))
+            else:
+                raise ValueError(f"Unknown zone type: {zone['type']}")
+        return zones
+
+def geofence_path_for(mission_file: str) -> Path:
+    """Zones for missions.json live next to it in missions_geofences.json"""
+    mission_file = Path(mission_file)
+    return mission_file.with_name(f"{mission_file.stem}_geofences.json")
+
+def load_geofences_for(mission_file: str) -> list[Zone]:
+    """Zones next to the mission file, or none if there is no zone file"""
+    zone_file = geofence_path_for(mission_file)
+    return load_geofences(zone_file) if zone_file.exists() else []
+
+# Zones covering more grid cells than this are kept out of the grid and always returned as candidates
+MAX_CELLS_PER_ZONE = 64
+
+class GeofenceIndex:
+    """ Uniform x/y grid over the zones' bounding boxes.
+        Each cell lists the zones whose box touches it, and a query walks only the cells a segment
+        passes through, so it only sees nearby zones. Zones far larger than the cell size
+        (a whole region, say) are few and are always candidates instead of filling the grid. """
+
+    def __init__(self, zones: list[Zone], cell_size: float | None = None):
+        self.zones = zones
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        self.large: list[int] = []
+        if not zones:
+            self.cell_size = 1.0
+            return
+
+        boxes = np.array([zone.bounds() for zone in zones], dtype=float)
+        if cell_size is None:
+            # Typical zone extent keeps each zone in a handful of cells
+            cell_size = float(np.median(np.maximum(boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1])))
+        self.cell_size = cell_size if cell_size > 0 else 1.0
+
+        for idx, (x_min, y_min, x_max, y_max) in enumerate(boxes):
+            i0, j0 = self._cell(x_min, y_min)
+            i1, j1 = self._cell(x_max, y_max)
+            if (i1 - i0 + 1) * (j1 - j0 + 1) > MAX_CELLS_PER_ZONE:
+                self.large.append(idx)
+                continue
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    self.cells.setdefault((i, j), []).append(idx)
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return int(np.floor(x / self.cell_size)), int(np.floor(y / self.cell_size))
+
+    def _cells_along(self, x0: float, y0: float, x1: float, y1: float) -> Iterator[tuple[int, int]]:
+        """Grid cells crossed by the segment (x0, y0) -> (x1, y1), walked cell by cell (DDA)"""
+        i, j = self._cell(x0, y0)
+        i_end, j_end = self._cell(x1, y1)
+        dx, dy = x1 - x0, y1 - y0
+        step_i, step_j = (1 if dx > 0 else -1), (1 if dy > 0 else -1)
+
+        # Segment parameter at the next vertical / horizontal cell border, and per whole cell
+        next_x = (i + (dx > 0)) * self.cell_size
+        next_y = (j + (dy > 0)) * self.cell_size
+        t_x = (next_x - x0) / dx if dx != 0 else float('inf')
+        t_y = (next_y - y0) / dy if dy != 0 else float('inf')
+        dt_x = self.cell_size / abs(dx) if dx != 0 else float('inf')
+        dt_y = self.cell_size / abs(dy) if dy != 0 else float('inf')
+
+        yield i, j
+        for _ in range(abs(i_end - i) + abs(j_end - j)):
+            if t_x < t_y:
+                i += step_i
+                t_x += dt_x
+            else:
+                j += step_j
+                t_y += dt_y
+            yield i, j
+
+    def candidates(self, x0: float, y0: float, x1: float, y1: float) -> list[int]:
+        """Indices of zones whose bounding box may touch the segment (x0, y0) -> (x1, y1)"""
+        found = set(self.large)
+        for cell in self._cells_along(x0, y0, x1, y1):
+            found.update(self.cells.get(cell, ()))
+        return sorted(found)
+
+def _altitude_interval(z0: float, dz: float, floor: float, ceiling: float) -> tuple[float, float] | None:
+    """Parameter interval u in [0, 1] where z0 + u*dz is between floor and ceiling"""
+    if dz == 0:
+        return (0.0, 1.0) if floor <= z0 <= ceiling else None
+    lo, hi = sorted(((floor - z0) / dz, (ceiling - z0) / dz))
+    lo, hi = max(0.0, lo), min(1.0, hi)
+    return (lo, hi) if lo <= hi else None
+
+def iter_geofence_breaches(missions: list[Mission], index: GeofenceIndex) -> Iterator[dict]:
+    """ Yields one record per (mission segment, zone, pass) with the entry and exit times.
+        Only zones returned by the index for the cells the segment crosses are tested. """
+    for mission in missions:
+        segments = mission_segments(mission)
+        p1 = segments.p0 + segments.vel * (segments.t1 - segments.t0)[:, None]
+        lo = np.minimum(segments.p0, p1)
+        hi = np.maximum(segments.p0, p1)
+
+        for k in range(len(segments)):
+            t0, t1 = float(segments.t0[k]), float(segments.t1[k])
+            a, b = segments.p0[k], p1[k]
+            for idx in index.candidates(a[0], a[1], b[0], b[1]):
+                zone = index.zones[idx]
+                if hi[k, 2] < zone.floor or lo[k, 2] > zone.ceiling:
+                    continue
+                altitude = _altitude_interval(a[2], b[2] - a[2], zone.floor, zone.ceiling)
+                if altitude is None:
+                    continue
+                for u_in, u_out in zone.horizontal_intervals(a[:2], b[:2] - a[:2]):
+                    u_in, u_out = max(u_in, altitude[0]), min(u_out, altitude[1])
+                    if u_in <= u_out:
+                        yield {
+                            'drone': mission.id,
+                            'zone': zone.id,
+                            'segment': k,
+                            'entry_time': t0 + u_in * (t1 - t0),
+                            'exit_time': t0 + u_out * (t1 - t0)
+                        }
+
+def check_geofences(missions: list[Mission], zones: list[Zone]) -> list[dict]:
+    """Entry/exit times of every mission segment through every zone it crosses"""
+    return list(iter_geofence_breaches(missions, GeofenceIndex(zones)))
+
+def merge_breaches(breaches: list[dict]) -> list[dict]:
+    """ One record per continuous stay: per-segment records of the same (drone, zone) whose intervals
+        touch are joined, keeping the segment the drone entered on. """
+    merged = []
+    open_stay: dict[tuple[str, str], dict] = {}
+    for breach in sorted(breaches, key=lambda b: b['entry_time']):
+        key = (breach['drone'], breach['zone'])
+        stay = open_stay.get(key)
+        if stay is not None and breach['entry_time'] <= stay['exit_time']:
+            stay['exit_time'] = max(stay['exit_time'], breach['exit_time'])
+        else:
+            open_stay[key] = dict(breach)
+            merged.append(open_stay[key])
+    return merged
@@ -1,5 +1,9 @@
-from dataclasses import dataclass
-from typing import List
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from .segment_bvh import SegmentBVH
 
 @dataclass
 class Waypoint:
@@ -8,31 +12,42 @@ class Waypoint:
     t: float       # Required (no default)
     z: float = 0.0 # Optional (has default)
 
-@dataclass 
+@dataclass
 class Mission:
+    """ position_at always reads the current waypoints. The BVH is a snapshot: it is never rebuilt
+        on its own, call build_bvh again after editing waypoints. """
     type: str
     id: str
     waypoints: List[Waypoint]
     time_window: tuple[float, float]
     safety_buffer: float = 5.0
-    
+    bvh: Optional["SegmentBVH"] = field(default=None, repr=False, compare=False)  # Built on demand by build_bvh
+
+    def build_bvh(self, leaf_size: int = 16) -> "SegmentBVH":
+        """Build (and keep) a bounding-volume hierarchy over the mission's segments, for long missions."""
+        from .segment_kernel import mission_segments
+        from .segment_bvh import SegmentBVH
+        self.bvh = SegmentBVH(mission_segments(self), leaf_size)
+        return self.bvh
+
     def position_at(self, t: float) -> tuple:
         """ Output:- (x,y,z) at time t using linear interpolation.
             Assumption:- Drone is moving in a straight line, to simplify the calculation. """
         if t <= self.waypoints[0].t:
             return (self.waypoints[0].x, self.waypoints[0].y, self.waypoints[0].z)
-        
+
         if t >= self.waypoints[-1].t:
             return (self.waypoints[-1].x, self.waypoints[-1].y, self.waypoints[-1].z)
-        
-        for i in range(len(self.waypoints)-1):
+
+        # Binary search for the segment holding t, waypoints are ordered in time
+        i = bisect_right(self.waypoints, t, key=lambda wp: wp.t) - 1
+        if 0 <= i < len(self.waypoints) - 1:
             wp1 = self.waypoints[i]
             wp2 = self.waypoints[i+1]
-            if wp1.t <= t <= wp2.t:
-                slope = (t - wp1.t) / (wp2.t - wp1.t) # Slope wrt time (4th dimention).
-                x = wp1.x + slope * (wp2.x - wp1.x)
-                y = wp1.y + slope * (wp2.y - wp1.y)
-                z = wp1.z + slope * (wp2.z - wp1.z)
-                return (x, y, z)
-    
-        raise ValueError("Time interpolation failed")
\ No newline at end of file
+            slope = (t - wp1.t) / (wp2.t - wp1.t) # Slope wrt time (4th dimention).
+            x = wp1.x + slope * (wp2.x - wp1.x)
+            y = wp1.y + slope * (wp2.y - wp1.y)
+            z = wp1.z + slope * (wp2.z - wp1.z)
+            return (x, y, z)
+
+        raise ValueError("Time interpolation failed")
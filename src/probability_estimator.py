@@ -0,0 +1,165 @@
+import numpy as np
+from .models import Mission
+from .conflict_detector import split_missions
+from .segment_kernel import DEFAULT_CHUNK_BYTES, Segments, closest_approach, mission_segments, overlapping_pairs
+
+# Perturbations beyond this many standard deviations are treated as impossible when trimming segment pairs
+_SIGMA_REACH = 5.0
+
+# Rough float64 footprint of one (sample, segment pair) in closest_approach
+_BYTES_PER_SAMPLE_PAIR = 8 * 48
+# and of one (sample, group) row while screening
+_BYTES_PER_SCREEN_ROW = 8 * 12
+
+# Segment pairs per fine screening group, fine groups per coarse group. Samples are screened against
+# coarse boxes, then fine boxes, before any exact check
+_GROUP_SIZE = 32
+_COARSE_GROUPS = 32
+
+def _padded_segments(mission: Mission, margin: float) -> Segments:
+    """Mission segments with a hold of `margin` seconds before and after, so time-shifted samples stay covered"""
+    seg = mission_segments(mission)
+    end = seg.p0[-1] + seg.vel[-1] * (seg.t1[-1] - seg.t0[-1])
+    return Segments(
+        t0=np.concatenate(([seg.t0[0] - margin], seg.t0, [seg.t1[-1]])),
+        t1=np.concatenate(([seg.t0[0]], seg.t1, [seg.t1[-1] + margin])),
+        p0=np.vstack([seg.p0[:1], seg.p0, end]),
+        vel=np.vstack([np.zeros(3), seg.vel, np.zeros(3)])
+    )
+
+def _expand(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenation of arange(start, start + count) for every (start, count)"""
+    return np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(int(counts.sum()))
+
+def _merge(level: tuple, size: int) -> tuple:
+    """ Merge every `size` consecutive groups of a level into one.
+        A level is (first, count, box_lo, box_hi, vel_mean, vel_dev): first item and item count of each group,
+        box of the nominal relative position, mean drone velocity and largest deviation from that mean. """
+    first, count, box_lo, box_hi, vel_mean, vel_dev = level
+    idx = np.arange(0, len(first), size)
+    merged_count = np.add.reduceat(count, idx)
+    merged_mean = np.add.reduceat(vel_mean * count[:, None], idx) / merged_count[:, None]
+    per_group = np.diff(np.append(idx, len(first)))
+    spread = vel_dev + np.linalg.norm(vel_mean - np.repeat(merged_mean, per_group, axis=0), axis=1)
+    return (first[idx], merged_count, np.minimum.reduceat(box_lo, idx), np.maximum.reduceat(box_hi, idx),
+            merged_mean, np.maximum.reduceat(spread, idx))
+
+def _may_breach(level: tuple, group: np.ndarray, shift: np.ndarray, delay: np.ndarray, buffer: float) -> np.ndarray:
+    """ False where the sample provably stays clear of every pair in the group.
+        The perturbed separation is rel - vel * delay + shift with rel inside the group's box. """
+    _, _, box_lo, box_hi, vel_mean, vel_dev = level
+    q = vel_mean[group] * delay[:, None] - shift
+    gap = np.maximum(0.0, np.maximum(box_lo[group] - q, q - box_hi[group]))
+    return np.linalg.norm(gap, axis=1) - vel_dev[group] * np.abs(delay) < buffer
+
+def conflict_probability(primary: Mission, drone: Mission, position_sigma: float = 1.0, time_sigma: float = 0.5,
+                         num_samples: int = 10000, seed: int | np.random.SeedSequence | None = None,
+                         max_chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> float:
+    """ Output:- Monte Carlo estimate of the probability that `drone` comes within the primary's safety buffer.
+        Each sample shifts both drones by an independent Gaussian position error (position_sigma per axis, metres)
+        and an independent Gaussian timing error (time_sigma, seconds), held for the whole flight.
+        Every sample is solved exactly with the closed-form closest approach, but only on the segment pairs
+        a 5-sigma perturbation could bring together, walked in time order: a sample is dropped once it
+        breaches, and skips every group of pairs whose relative-position box it provably stays clear of.
+        Same seed -> same estimate. """
+    start = max(primary.time_window[0], drone.time_window[0])
+    end = min(primary.time_window[1], drone.time_window[1])
+    if start > end:
+        return 0.0
+
+    margin = _SIGMA_REACH * time_sigma
+    a = _padded_segments(primary, margin)
+    b = _padded_segments(drone, margin)
+    buffer = primary.safety_buffer
+
+    # With timing errors the drone's segment j runs up to `slack` seconds against primary segment i.
+    # In the primary's clock the perturbed separation is A_i(u) - B_j(u) - vel_j * delay + shift, so along the
+    # pair's lines extended by `slack` it never gets below the nominal closest approach minus these terms.
+    slack = 2 * margin
+    rows, cols = overlapping_pairs(a, [b], slack=slack)
+    lo = np.maximum(a.t0[rows], b.t0[cols]) - slack
+    hi = np.minimum(a.t1[rows], b.t1[cols]) + slack
+    nominal2, _, _ = closest_approach(lo, hi, a.t0[rows], a.p0[rows], a.vel[rows],
+                                      b.t0[cols], b.p0[cols], b.vel[cols], buffer)
+    reach = _SIGMA_REACH * np.sqrt(6) * position_sigma + slack * np.linalg.norm(b.vel[cols], axis=1)
+    keep = np.sqrt(nominal2) - reach < buffer
+    rows, cols, lo, hi = rows[keep], cols[keep], lo[keep], hi[keep]
+
+    # Draw every sample up front so the estimate does not depend on chunking
+    rng = np.random.default_rng(seed)
+    a_shift = rng.normal(0.0, position_sigma, size=(num_samples, 3))
+    b_shift = rng.normal(0.0, position_sigma, size=(num_samples, 3))
+    a_delay = rng.normal(0.0, time_sigma, size=num_samples)
+    b_delay = rng.normal(0.0, time_sigma, size=num_samples)
+    if len(rows) == 0:
+        return 0.0
+    shift = a_shift - b_shift
+    delay = a_delay - b_delay
+
+    # Screening levels over the time-ordered pairs: single pairs -> fine groups -> coarse groups
+    rel_lo = (a.p0[rows] + a.vel[rows] * (lo - a.t0[rows])[:, None]) - (b.p0[cols] + b.vel[cols] * (lo - b.t0[cols])[:, None])
+    rel_hi = (a.p0[rows] + a.vel[rows] * (hi - a.t0[rows])[:, None]) - (b.p0[cols] + b.vel[cols] * (hi - b.t0[cols])[:, None])
+    pairs = (np.arange(len(rows)), np.ones(len(rows), dtype=int), np.minimum(rel_lo, rel_hi),
+             np.maximum(rel_lo, rel_hi), b.vel[cols], np.zeros(len(rows)))
+    fine = _merge(pairs, _GROUP_SIZE)
+    coarse = _merge(fine, _COARSE_GROUPS)
+
+    breached = np.zeros(num_samples, dtype=bool)
+    active = np.arange(num_samples)
+    chunk = max(1, max_chunk_bytes // _BYTES_PER_SAMPLE_PAIR)
+    screen_rows = max(1, max_chunk_bytes // _BYTES_PER_SCREEN_ROW)
+    num_fine = len(fine[0])
+    g, step = 0, 1
+    while g < num_fine and len(active):
+        # Start with one fine group so early breaches drop out cheaply, then widen as the active set allows
+        step = max(1, min(step, num_fine - g, screen_rows // len(active)))
+        stop = g + step
+
+        # Coarse screening of the coarse groups overlapping [g, stop), then fine screening of their fine groups in range
+        first, last = g // _COARSE_GROUPS, (stop - 1) // _COARSE_GROUPS + 1
+        smp = np.repeat(active, last - first)
+        grp = np.tile(np.arange(first, last), len(active))
+        hit = _may_breach(coarse, grp, shift[smp], delay[smp], buffer)
+        smp, grp = smp[hit], grp[hit]
+        lo_fine = np.maximum(grp * _COARSE_GROUPS, g)
+        count = np.minimum(grp * _COARSE_GROUPS + _COARSE_GROUPS, stop) - lo_fine
+        smp = np.repeat(smp, count)
+        grp = _expand(lo_fine, count)
+        hit = _may_breach(fine, grp, shift[smp], delay[smp], buffer)
+        smp, grp = smp[hit], grp[hit]
+
+        # Exact check of every pair in the fine groups that could not be ruled out
+        pair_samples = np.repeat(smp, fine[1][grp])
+        pair_idx = _expand(fine[0][grp], fine[1][grp])
+        for c in range(0, len(pair_idx), chunk):
+            smp_c, ia, jb = pair_samples[c:c + chunk], rows[pair_idx[c:c + chunk]], cols[pair_idx[c:c + chunk]]
+            a_t0 = a.t0[ia] + a_delay[smp_c]
+            b_t0 = b.t0[jb] + b_delay[smp_c]
+            dist2, _, _ = closest_approach(
+                np.maximum(np.maximum(a_t0, b_t0), start),
+                np.minimum(np.minimum(a.t1[ia] + a_delay[smp_c], b.t1[jb] + b_delay[smp_c]), end),
+                a_t0, a.p0[ia] + a_shift[smp_c], a.vel[ia],
+                b_t0, b.p0[jb] + b_shift[smp_c], b.vel[jb],
+                buffer
+            )
+            breached[smp_c[dist2 < buffer * buffer]] = True
+
+        active = active[~breached[active]]
+        g = stop
+        step *= 2
+
+    return int(np.count_nonzero(breached)) / num_samples
+
+def add_conflict_probabilities(mission_sets: list[Mission], conflicts: list[dict], position_sigma: float = 1.0,
+                               time_sigma: float = 0.5, num_samples: int = 10000, seed: int | None = None) -> list[dict]:
+    """ Attach a 'probability' of separation loss to every conflict returned by detect_conflicts.
+        Each pair draws from its own stream spawned from `seed`. """
+    primary, simulated = split_missions(mission_sets)
+    drones = {drone.id: drone for drone in simulated}
+    streams = np.random.SeedSequence(seed).spawn(len(conflicts))
+    for conflict, stream in zip(conflicts, streams):
+        conflict['probability'] = conflict_probability(
+            primary, drones[conflict['conflicting_drone']],
+            position_sigma, time_sigma, num_samples, stream
+        )
+    return conflicts
@@ -0,0 +1,76 @@
+import numpy as np
+from .segment_kernel import Segments, segment_pair_kernel
+
+class SegmentBVH:
+    """ Bounding-volume hierarchy over a mission's segments in (x, y, z, t).
+        Segments are already ordered in time, so leaves are runs of `leaf_size` consecutive segments
+        and every level above merges neighbouring boxes pairwise. levels[0] are the leaves, levels[-1] the root. """
+
+    def __init__(self, segments: Segments, leaf_size: int = 16):
+        self.segments = segments
+        self.leaf_size = leaf_size
+
+        p1 = segments.p0 + segments.vel * (segments.t1 - segments.t0)[:, None]
+        seg_lo = np.column_stack([np.minimum(segments.p0, p1), segments.t0])
+        seg_hi = np.column_stack([np.maximum(segments.p0, p1), segments.t1])
+
+        starts = np.arange(0, len(segments), leaf_size)
+        self.levels = [(np.minimum.reduceat(seg_lo, starts), np.maximum.reduceat(seg_hi, starts))]
+        while len(self.levels[-1][0]) > 1:
+            lo, hi = self.levels[-1]
+            pairs = np.arange(0, len(lo), 2)
+            self.levels.append((np.minimum.reduceat(lo, pairs), np.maximum.reduceat(hi, pairs)))
+
+    @property
+    def root(self) -> tuple[int, int]:
+        return len(self.levels) - 1, 0
+
+    def box(self, node: tuple[int, int]) -> tuple[np.ndarray, np.ndarray]:
+        level, idx = node
+        return self.levels[level][0][idx], self.levels[level][1][idx]
+
+    def children(self, node: tuple[int, int]) -> list[tuple[int, int]]:
+        """Child nodes in time order"""
+        level, idx = node
+        return [(level - 1, i) for i in (2 * idx, 2 * idx + 1) if i < len(self.levels[level - 1][0])]
+
+    def leaf_segments(self, node: tuple[int, int]) -> Segments:
+        _, idx = node
+        return self.segments[idx * self.leaf_size:(idx + 1) * self.leaf_size]
+
+def bvh_first_breach(a: SegmentBVH, b: SegmentBVH, buffer: float) -> tuple[float, float, float]:
+    """ Output:- (first_breach, min_distance, closest_time) like segment_pair_kernel for one pair of missions.
+        Descends only into node pairs that share time and whose boxes are closer than `buffer`.
+        Pruned pairs are never closer than `buffer`, so min_distance and closest_time are exact
+        whenever there is a breach (otherwise they only cover the visited leaves). """
+    best, min_distance, closest_time = np.inf, np.inf, np.nan
+    stack = [(a.root, b.root)]
+
+    while stack:
+        node_a, node_b = stack.pop()
+        a_lo, a_hi = a.box(node_a)
+        b_lo, b_hi = b.box(node_b)
+
+        # Shared time
+        if max(a_lo[3], b_lo[3]) > min(a_hi[3], b_hi[3]):
+            continue
+        # Spatial gap between the boxes
+        gap = np.maximum(0.0, np.maximum(a_lo[:3] - b_hi[:3], b_lo[:3] - a_hi[:3]))
+        if gap @ gap >= buffer * buffer:
+            continue
+
+        if node_a[0] == 0 and node_b[0] == 0:
+            breach, distance, t_min = segment_pair_kernel(a.leaf_segments(node_a), [b.leaf_segments(node_b)], buffer)
+            best = min(best, float(breach[0]))
+            if distance[0] < min_distance:
+                min_distance, closest_time = float(distance[0]), float(t_min[0])
+            continue
+
+        # Split the higher node; push the later child first so the earlier one is checked first
+        if node_a[0] >= node_b[0]:
+            pairs = [(child, node_b) for child in a.children(node_a)]
+        else:
+            pairs = [(node_a, child) for child in b.children(node_b)]
+        stack.extend(reversed(pairs))
+
+    return best, min_distance, closest_time
@@ -0,0 +1,138 @@
+import numpy as np
+from dataclasses import dataclass
+from .models import Mission
+
+# Default ceiling for the temporaries of one chunk of segment pairs (64 MiB)
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Rough float64 footprint of one segment pair: ~10 (pairs, 3) and ~12 (pairs,) temporaries, plus gathered inputs
+_BYTES_PER_PAIR = 8 * 48
+
+@dataclass
+class Segments:
+    """Straight-line flight segments of a mission as flat NumPy arrays.
+       Segment k starts at p0[k] at time t0[k] and moves with constant vel[k] until t1[k]."""
+    t0: np.ndarray   # (n,)
+    t1: np.ndarray   # (n,)
+    p0: np.ndarray   # (n, 3)
+    vel: np.ndarray  # (n, 3)
+
+    def __len__(self) -> int:
+        return len(self.t0)
+
+    def __getitem__(self, index: slice) -> "Segments":
+        return Segments(t0=self.t0[index], t1=self.t1[index], p0=self.p0[index], vel=self.vel[index])
+
+def mission_segments(mission: Mission) -> Segments:
+    """ Output:- Segments covering the mission's time window.
+        Before the first / after the last waypoint the drone holds position, same as Mission.position_at. """
+    wp_t = np.array([wp.t for wp in mission.waypoints], dtype=float)
+    wp_p = np.array([(wp.x, wp.y, wp.z) for wp in mission.waypoints], dtype=float)
+    start, end = mission.time_window
+
+    # Knots are the window edges plus every waypoint strictly inside the window
+    inner = wp_t[(wp_t > start) & (wp_t < end)]
+    knots = np.unique(np.concatenate(([start], inner, [end])))
+    if len(knots) == 1:
+        knots = np.repeat(knots, 2)  # Zero-length window still gets one (stationary) segment
+
+    positions = np.column_stack([np.interp(knots, wp_t, wp_p[:, axis]) for axis in range(3)])
+    dt = np.diff(knots)
+    dp = np.diff(positions, axis=0)
+    vel = np.divide(dp, dt[:, None], out=np.zeros_like(dp), where=dt[:, None] > 0)
+
+    return Segments(t0=knots[:-1], t1=knots[1:], p0=positions[:-1], vel=vel)
+
+def overlapping_pairs(primary: Segments, others: list[Segments], slack: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+    """ Output:- (rows, cols) of every (primary segment, other segment) pair sharing time, within `slack` seconds.
+        cols index the concatenation of `others`. Segments are ordered in time, so each primary segment
+        only meets a contiguous run of every other mission's segments, found with searchsorted. """
+    rows, cols = [], []
+    offset = 0
+    for other in others:
+        lo = np.searchsorted(other.t1, primary.t0 - slack, side='left')
+        hi = np.searchsorted(other.t0, primary.t1 + slack, side='right')
+        counts = np.maximum(hi - lo, 0)
+        total = int(counts.sum())
+        if total:
+            row = np.repeat(np.arange(len(primary)), counts)
+            run_start = np.repeat(np.cumsum(counts) - counts, counts)
+            rows.append(row)
+            cols.append(offset + lo[row] + np.arange(total) - run_start)
+        offset += len(other)
+    if not rows:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+    return np.concatenate(rows), np.concatenate(cols)
+
+def closest_approach(ts, te, a_t0, a_p0, a_vel, b_t0, b_p0, b_vel, buffer: float):
+    """ Closed-form closest approach of two linearly moving points over [ts, te], broadcasting over any shape.
+        Output:- (dist2, t_min, breach): squared minimum distance (inf if te < ts), its time,
+        and the first time the separation drops below `buffer` (inf if never). """
+    overlap = te >= ts
+    span = np.where(overlap, te - ts, 0.0)
+    buffer2 = buffer * buffer
+
+    # Relative motion r(tau) = r0 + v * tau, tau measured from ts
+    r0 = (a_p0 + a_vel * (ts - a_t0)[..., None]) - (b_p0 + b_vel * (ts - b_t0)[..., None])
+    v = a_vel - b_vel
+
+    cq = np.einsum('...k,...k->...', r0, r0)
+    bq = np.einsum('...k,...k->...', r0, v)
+    aq = np.einsum('...k,...k->...', v, v)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Closest approach inside the overlap
+        tau_min = np.where(aq > 0, np.clip(-bq / aq, 0.0, span), 0.0)
+        dist2 = cq + 2 * bq * tau_min + aq * tau_min ** 2
+        dist2 = np.where(overlap, np.maximum(dist2, 0.0), np.inf)
+
+        # Entry into the buffer sphere: smaller root of |r0 + v tau|^2 = buffer^2
+        disc = np.maximum(bq * bq - aq * (cq - buffer2), 0.0)
+        tau_in = np.where(cq < buffer2, 0.0, (-bq - np.sqrt(disc)) / aq)
+    breach = np.where(dist2 < buffer2, ts + tau_in, np.inf)
+
+    return dist2, ts + tau_min, breach
+
+def segment_pair_kernel(primary: Segments, others: list[Segments], buffer: float,
+                        max_chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ Output:- (first_breach, min_distance, closest_time), one entry per mission in `others`.
+        first_breach is the earliest time the separation drops below `buffer` (inf if never),
+        min_distance is the closest approach over the shared time (inf if no shared time)
+        and closest_time is when it happens (nan if no shared time).
+        Only segment pairs sharing time are evaluated, in flat chunks whose temporaries
+        stay under `max_chunk_bytes`. """
+    first_breach = np.full(len(others), np.inf)
+    min_dist2 = np.full(len(others), np.inf)
+    closest_time = np.full(len(others), np.nan)
+    if not others or len(primary) == 0:
+        return first_breach, np.sqrt(min_dist2), closest_time
+
+    # Stack every other mission into one set of columns, remembering who owns each segment
+    owner = np.repeat(np.arange(len(others)), [len(s) for s in others])
+    b_t0 = np.concatenate([s.t0 for s in others])
+    b_t1 = np.concatenate([s.t1 for s in others])
+    b_p0 = np.concatenate([s.p0 for s in others])
+    b_vel = np.concatenate([s.vel for s in others])
+
+    rows, cols = overlapping_pairs(primary, others)
+    chunk = max(1, max_chunk_bytes // _BYTES_PER_PAIR)
+
+    for c in range(0, len(rows), chunk):
+        ia, jb = rows[c:c + chunk], cols[c:c + chunk]
+        dist2, t_min, breach = closest_approach(
+            np.maximum(primary.t0[ia], b_t0[jb]), np.minimum(primary.t1[ia], b_t1[jb]),
+            primary.t0[ia], primary.p0[ia], primary.vel[ia],
+            b_t0[jb], b_p0[jb], b_vel[jb],
+            buffer
+        )
+        own = owner[jb]
+        np.minimum.at(first_breach, own, breach)
+
+        # Pairs are grouped by owner, keep the closest pair of each owner in this chunk
+        order = np.lexsort((dist2, own))
+        first = order[np.r_[True, own[order][1:] != own[order][:-1]]]
+        better = dist2[first] < min_dist2[own[first]]
+        min_dist2[own[first][better]] = dist2[first][better]
+        closest_time[own[first][better]] = t_min[first][better]
+
+    return first_breach, np.sqrt(min_dist2), closest_time
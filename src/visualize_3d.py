@@ -1,8 +1,10 @@
 import plotly.graph_objects as go
+from plotly.utils import PlotlyJSONEncoder
 from .models import Mission
 import numpy as np
 import pandas as pd
 import os
+import json
 from typing import List
 
 # Color scheme
@@ -29,7 +31,94 @@ def create_drone_mesh(pos, size=0.2):
         [pos[0], pos[1]-size, pos[2]]   # Back
     ]
 
-def plot_conflicts_3d(primary: Mission, simulated: List[Mission], conflicts: list, output_path: str):
+# Streams frame chunks into the page while playing; {plot_id} is filled in by plotly, __CHUNKS__ by us
+LAZY_FRAMES_SCRIPT = """
+(function() {
+    var gd = document.getElementById('{plot_id}');
+    var chunks = __CHUNKS__;
+    var loaded = [];
+    var current = 0;
+    var playing = false;
+
+    function fetchChunk(i) {
+        if (!loaded[i]) {
+            loaded[i] = fetch(chunks[i])
+                .then(function(response) { return response.json(); })
+                .then(function(frames) {
+                    return Plotly.addFrames(gd, frames).then(function() {
+                        return frames.map(function(frame) { return frame.name; });
+                    });
+                });
+        }
+        return loaded[i];
+    }
+
+    function playFrom(i) {
+        if (i >= chunks.length) {  // Finished, next Play starts over
+            playing = false;
+            current = 0;
+            return;
+        }
+        current = i;
+        if (!playing) { return; }  // Paused, next Play resumes at chunk i
+        fetchChunk(i).then(function(names) {
+            if (i + 1 < chunks.length) { fetchChunk(i + 1); }  // Prefetch while this chunk plays
+            return Plotly.animate(gd, names, {frame: {duration: 40, redraw: true}, transition: {duration: 0}});
+        }).then(function() { playFrom(i + 1); }, function() { playing = false; });
+    }
+
+    gd.on('plotly_buttonclicked', function(event) {
+        if (event.button.label.indexOf('Play') >= 0) {
+            if (!playing) { playing = true; playFrom(current); }
+        } else {
+            playing = false;
+        }
+    });
+})();
+"""
+
+def write_lightweight_html(fig: go.Figure, output_path: str, frames_per_chunk: int = 10):
+    """ Write the figure without inline frames or plotly.js.
+        plotly.min.js is written once next to the HTML and shared by every report in that folder,
+        frames go to compact JSON chunks in <name>_frames/ that the page fetches while playing.
+        The page opens on the first frame and waits for Play instead of auto-playing.
+        Browsers block fetch() on file:// pages, so open the report through a local server
+        (e.g. python -m http.server). """
+    output_dir = os.path.dirname(output_path)
+    stem = os.path.splitext(os.path.basename(output_path))[0]
+    frames_dir = os.path.join(output_dir, f"{stem}_frames")
+    os.makedirs(frames_dir, exist_ok=True)
+
+    frames = [frame.to_plotly_json() for frame in fig.frames]
+    chunk_urls = []
+    for idx, start in enumerate(range(0, len(frames), frames_per_chunk)):
+        name = f"chunk_{idx:03d}.json"
+        with open(os.path.join(frames_dir, name), 'w') as f:
+            json.dump(frames[start:start + frames_per_chunk], f, cls=PlotlyJSONEncoder, separators=(',', ':'))
+        chunk_urls.append(f"{stem}_frames/{name}")
+
+    # Play is handled by the script, Pause still interrupts the running animation natively
+    light = go.Figure(fig)
+    light.frames = []
+
+    # Show the first frame before Play, the lightweight page does not auto-play
+    if fig.frames:
+        for trace, first in zip(light.data, fig.frames[0].data):
+            trace.update(x=first.x, y=first.y, z=first.z)
+    light.layout.updatemenus[0].buttons[0].update(method="skip", args=[None])
+
+    light.write_html(
+        output_path,
+        include_plotlyjs='directory',
+        auto_play=False,
+        post_script=LAZY_FRAMES_SCRIPT.replace('__CHUNKS__', json.dumps(chunk_urls))
+    )
+
+def plot_conflicts_3d(primary: Mission, simulated: List[Mission], conflicts: list, output_path: str,
+                      lightweight: bool = False, frames_per_chunk: int = 10):
+    """ Animated 3D view of all trajectories and conflicts.
+        lightweight=True writes a small HTML with shared plotly.js and lazily loaded frame chunks
+        (see write_lightweight_html) instead of one self-contained file. """
     # Generate all trajectories with the same number of points
     num_points = 150  # Fixed number of points for all drones
     primary_traj = generate_trajectory(primary, num_points)
@@ -212,4 +301,7 @@ def plot_conflicts_3d(primary: Mission, simulated: List[Mission], conflicts: lis
     
     # Save output
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    fig.write_html(output_path)
\ No newline at end of file
+    if lightweight:
+        write_lightweight_html(fig, output_path, frames_per_chunk)
+    else:
+        fig.write_html(output_path)
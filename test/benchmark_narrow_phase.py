@@ -0,0 +1,91 @@
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models import Mission, Waypoint
+from src.conflict_detector import detect_conflicts
+from src.probability_estimator import conflict_probability
+
+# Configuration
+NUM_DRONES = 200
+NUM_WAYPOINTS = 50
+MISSION_DURATION = 1000  # seconds
+REPEATS = 3
+
+def generate_mission(drone_id: str, mission_type: str) -> Mission:
+    """Random walk through a 1 km cube, waypoints spread evenly over the mission"""
+    step = MISSION_DURATION / (NUM_WAYPOINTS - 1)
+    waypoints = [
+        Waypoint(x=random.uniform(0, 1000), y=random.uniform(0, 1000), z=random.uniform(10, 120), t=i * step)
+        for i in range(NUM_WAYPOINTS)
+    ]
+    return Mission(type=mission_type, id=drone_id, waypoints=waypoints,
+                   time_window=(0, MISSION_DURATION), safety_buffer=5.0)
+
+def best_of(method: str, missions: list[Mission]) -> tuple[float, int]:
+    """Best wall-clock time over REPEATS runs"""
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        conflicts = detect_conflicts(missions, method=method)
+        timings.append(time.perf_counter() - start)
+    return min(timings), len(conflicts)
+
+def long_crossing_missions(num_waypoints: int) -> list[Mission]:
+    """Two long survey lines that pass each other once, halfway through"""
+    duration = float(num_waypoints)
+    primary = [Waypoint(x=float(i), y=0.0, z=50.0, t=float(i)) for i in range(num_waypoints)]
+    other = [Waypoint(x=duration - i, y=2.0, z=50.0, t=float(i)) for i in range(num_waypoints)]
+    return [
+        Mission(type="primary", id="survey_a", waypoints=primary, time_window=(0, duration - 1), safety_buffer=5.0),
+        Mission(type="simulated", id="survey_b", waypoints=other, time_window=(0, duration - 1))
+    ]
+
+def formation_missions(num_waypoints: int, gap: float) -> list[Mission]:
+    """Two drones flying side by side, `gap` metres apart, for the whole mission"""
+    duration = float(num_waypoints - 1)
+    primary = [Waypoint(x=5.0 * i, y=0.0, z=50.0, t=float(i)) for i in range(num_waypoints)]
+    other = [Waypoint(x=5.0 * i, y=gap, z=50.0, t=float(i)) for i in range(num_waypoints)]
+    return [
+        Mission(type="primary", id="lead", waypoints=primary, time_window=(0, duration), safety_buffer=5.0),
+        Mission(type="simulated", id="wing", waypoints=other, time_window=(0, duration))
+    ]
+
+if __name__ == "__main__":
+    random.seed(42)
+    missions = [generate_mission("alpha", "primary")]
+    missions += [generate_mission(f"drone_{i}", "simulated") for i in range(NUM_DRONES)]
+
+    sampled_time, sampled_hits = best_of("sampled", missions)
+    vectorized_time, vectorized_hits = best_of("vectorized", missions)
+
+    print(f"{NUM_DRONES} drones x {NUM_WAYPOINTS} waypoints")
+    print(f"sampled loop      :- {sampled_time * 1000:8.1f} ms ({sampled_hits} conflicts)")
+    print(f"vectorized kernel :- {vectorized_time * 1000:8.1f} ms ({vectorized_hits} conflicts)")
+    print(f"speedup           :- {sampled_time / vectorized_time:.1f}x")
+    # Not like-for-like: the sampled loop only looks at waypoint times plus one sample every 10 s,
+    # the kernel solves every segment pair exactly, so it finds conflicts the loop steps over
+    print("note              :- sampled loop checks every 10 s only, kernel is exact; conflict counts differ")
+
+    for num_waypoints in (1000, 10000):
+        long_missions = long_crossing_missions(num_waypoints)
+        sampled_time, _ = best_of("sampled", long_missions)
+        flat_time, _ = best_of("vectorized", long_missions)
+        for mission in long_missions:
+            mission.build_bvh()
+        bvh_time, _ = best_of("vectorized", long_missions)
+        print(f"{num_waypoints} waypoint crossing :- sampled {sampled_time * 1000:8.1f} ms, "
+              f"kernel {flat_time * 1000:8.1f} ms, BVH {bvh_time * 1000:8.1f} ms")
+
+    # Target: well under a second for 10000 samples, even for a pair that stays close the whole way
+    for num_waypoints in (200, 2000, 10000):
+        for gap in (3.0, 5.5, 8.0):
+            lead, wing = formation_missions(num_waypoints, gap)
+            start = time.perf_counter()
+            probability = conflict_probability(lead, wing, seed=0)
+            elapsed = time.perf_counter() - start
+            print(f"{num_waypoints} waypoint formation, {gap} m apart :- "
+                  f"probability {probability:.4f} in {elapsed * 1000:8.1f} ms")